@@ -25,7 +25,7 @@ def main():
         is_athlete=False
     )
     
-    # Apply the function: Student → List[CampusService]
+    # Apply the function: Student → Tuple[CampusService, ...]
     undergrad_services = authorize_campus_services(undergrad_student)
     grad_services = authorize_campus_services(grad_student)
     
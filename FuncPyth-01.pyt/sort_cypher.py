@@ -1,34 +1,31 @@
 #!/usr/bin/env python3
 
 import sys
-from typing import List, Set
+from typing import List, Set, Tuple
 
-def read_cypher_file(filename: str) -> List[str]:
+def read_dedup_sort(filename: str) -> Tuple[int, List[str]]:
     """
-    Pure function: filename → List[str]
-    Reads all lines from cypher file
+    Pure function: filename → (int, List[str])
+    Fuses reading and deduplication in one pass over the file, returning
+    the number of non-empty lines read and the sorted unique lines
     """
+    unique_lines: Set[str] = set()
+    line_count = 0
     try:
         with open(filename, 'r', encoding='utf-8') as f:
-            return [line.strip() for line in f.readlines()]
+            for line in f:
+                line = line.strip()
+                if line:  # Skip empty lines
+                    unique_lines.add(line)
+                    line_count += 1
     except FileNotFoundError:
         print(f"Error: File '{filename}' not found.")
         sys.exit(1)
     except IOError as e:
         print(f"Error reading file '{filename}': {e}")
         sys.exit(1)
-
-def remove_duplicates_and_sort(lines: List[str]) -> List[str]:
-    """
-    Pure function: List[str] → List[str]
-    Removes duplicates and sorts lines alphabetically
-    """
-    unique_lines: Set[str] = set()
-    for line in lines:
-        if line.strip():  # Skip empty lines
-            unique_lines.add(line.strip())
     
-    return sorted(list(unique_lines))
+    return line_count, sorted(unique_lines)
 
 def write_sorted_cypher(lines: List[str], filename: str) -> None:
     """
@@ -36,8 +33,9 @@ def write_sorted_cypher(lines: List[str], filename: str) -> None:
     """
     try:
         with open(filename, 'w', encoding='utf-8') as f:
-            for line in lines:
-                f.write(line + '\n')
+            f.write('\n'.join(lines))
+            if lines:  # Add newline at end if there are lines
+                f.write('\n')
     except IOError as e:
         print(f"Error writing to file '{filename}': {e}")
         sys.exit(1)
@@ -45,17 +43,15 @@ def write_sorted_cypher(lines: List[str], filename: str) -> None:
 def main():
     """
     Main function implementing the composition:
-    cr.cypher → List[str] → List[str] → crun.cypher
+    cr.cypher → (int, List[str]) → crun.cypher
     """
     input_filename = "cr.cypher"
     output_filename = "crun.cypher"
     
-    # Function composition: file → lines → sorted_unique_lines → file
-    lines = read_cypher_file(input_filename)
-    sorted_unique_lines = remove_duplicates_and_sort(lines)
+    # Function composition: file → sorted_unique_lines → file
+    original_count, sorted_unique_lines = read_dedup_sort(input_filename)
     write_sorted_cypher(sorted_unique_lines, output_filename)
     
-    original_count = len([line for line in lines if line.strip()])
     final_count = len(sorted_unique_lines)
     duplicates_removed = original_count - final_count
     
@@ -1,6 +1,8 @@
 from dataclasses import dataclass
-from typing import List, Literal
-from enum import Enum
+from typing import Callable, Dict, FrozenSet, Literal, Tuple, get_args
+from enum import Enum, IntFlag
+from functools import reduce
+from operator import or_
 
 class StudentLevel(Enum):
     UNDERGRADUATE = "undergraduate"
@@ -43,97 +45,97 @@ CampusService = Literal[
     "academic_support"
 ]
 
-def authorize_campus_services(student: Student) -> List[CampusService]:
-    """
-    Pure function that maps Student → List[CampusService]
-    Following functional composition principles: f: Student → List[CampusService]
-    """
-    services: List[CampusService] = []
-    
+# Each service is one bit, assigned in alphabetical order so that decoding a
+# mask from the low bit upwards yields service names already sorted
+CampusServiceFlag = IntFlag(
+    "CampusServiceFlag",
+    [service.upper() for service in sorted(get_args(CampusService))]
+)
+
+def _flags(services: Tuple[CampusService, ...]) -> CampusServiceFlag:
+    return reduce(or_, (CampusServiceFlag[service.upper()] for service in services))
+
+def _mask_to_names(mask: int) -> Tuple[CampusService, ...]:
+    return tuple(flag.name.lower() for flag in CampusServiceFlag if mask & flag)
+
+# Disjoint service groups, kept in sorted order
+_BASE_SORTED: Tuple[CampusService, ...] = (
+    "career_services",
+    "counseling_services",
+    "email_account",
+    "health_services",
+    "library_access",
+    "student_portal",
+    "wifi_access"
+)
+_FT_SORTED: Tuple[CampusService, ...] = ("gym_membership", "tutoring_center")
+_UG_SORTED: Tuple[CampusService, ...] = ("academic_support",)
+_HONORS_SORTED: Tuple[CampusService, ...] = ("honors_program",)
+_GRAD_SORTED: Tuple[CampusService, ...] = ("graduate_resources", "research_databases")
+_DOC_SORTED: Tuple[CampusService, ...] = ("dissertation_support",)
+
+# Rule table compiled once at import: (predicate, services granted when it holds)
+RULES: Tuple[Tuple[Callable[[Student], bool], CampusServiceFlag], ...] = (
     # Base services for all active students
-    if student.status != StudentStatus.INACTIVE:
-        services.extend([
-            "library_access",
-            "student_portal", 
-            "email_account",
-            "wifi_access",
-            "health_services",
-            "counseling_services",
-            "career_services"
-        ])
-    
+    (lambda s: s.status != StudentStatus.INACTIVE, _flags(_BASE_SORTED)),
     # Full-time student services
-    if student.status == StudentStatus.FULL_TIME:
-        services.extend([
-            "gym_membership",
-            "tutoring_center"
-        ])
-    
+    (lambda s: s.status == StudentStatus.FULL_TIME, _flags(_FT_SORTED)),
     # Academic level-based services
-    if student.level == StudentLevel.UNDERGRADUATE:
-        services.append("academic_support")
-        if student.gpa >= 3.5:
-            services.append("honors_program")
-    
-    elif student.level in [StudentLevel.GRADUATE, StudentLevel.DOCTORAL]:
-        services.extend([
-            "research_databases",
-            "graduate_resources"
-        ])
-        
-        if student.level == StudentLevel.DOCTORAL:
-            services.append("dissertation_support")
-    
+    (lambda s: s.level == StudentLevel.UNDERGRADUATE, _flags(_UG_SORTED)),
+    (lambda s: s.level == StudentLevel.UNDERGRADUATE and s.gpa >= 3.5, _flags(_HONORS_SORTED)),
+    (lambda s: s.level in (StudentLevel.GRADUATE, StudentLevel.DOCTORAL), _flags(_GRAD_SORTED)),
+    (lambda s: s.level == StudentLevel.DOCTORAL, _flags(_DOC_SORTED)),
     # Conditional services based on student attributes
-    if student.is_international:
-        services.append("international_student_services")
-    
-    if student.has_disabilities:
-        services.append("disability_services")
-    
-    if student.is_athlete:
-        services.append("athletic_facilities")
-    
-    return sorted(list(set(services)))
-
-from student_services import Student, StudentLevel, StudentStatus, authorize_campus_services
-
-# Example usage demonstrating the functional composition
-def main():
-    # Create sample students
-    undergrad_student = Student(
-        student_id="12345",
-        level=StudentLevel.UNDERGRADUATE,
-        status=StudentStatus.FULL_TIME,
-        gpa=3.7,
-        credit_hours=15,
-        is_international=False,
-        has_disabilities=False,
-        is_athlete=True
-    )
-    
-    grad_student = Student(
-        student_id="67890", 
-        level=StudentLevel.GRADUATE,
-        status=StudentStatus.PART_TIME,
-        gpa=3.9,
-        credit_hours=9,
-        is_international=True,
-        has_disabilities=True,
-        is_athlete=False
+    (lambda s: s.is_international, _flags(("international_student_services",))),
+    (lambda s: s.has_disabilities, _flags(("disability_services",))),
+    (lambda s: s.is_athlete, _flags(("athletic_facilities",))),
+)
+
+# Only the attributes the rules read; a few hundred distinct keys at most
+RuleKey = Tuple[StudentStatus, StudentLevel, bool, bool, bool, bool]
+
+def _reachable_masks() -> FrozenSet[int]:
+    masks = {0}
+    for _, bits in RULES:
+        masks |= {mask | bits for mask in masks}
+    return frozenset(masks)
+
+# Every mask some combination of rules can produce, decoded once at import
+BIT_TO_SORTED_TUPLE: Dict[int, Tuple[CampusService, ...]] = {
+    mask: _mask_to_names(mask) for mask in _reachable_masks()
+}
+_AUTHORIZATION_CACHE: Dict[RuleKey, Tuple[CampusService, ...]] = {}
+
+def _rule_key(student: Student) -> RuleKey:
+    return (
+        student.status,
+        student.level,
+        student.gpa >= 3.5,
+        student.is_international,
+        student.has_disabilities,
+        student.is_athlete
     )
-    
-    # Apply the function: Student → List[CampusService]
-    undergrad_services = authorize_campus_services(undergrad_student)
-    grad_services = authorize_campus_services(grad_student)
-    
-    print("Undergraduate student services:")
-    for service in undergrad_services:
-        print(f"  - {service}")
-    
-    print("\nGraduate student services:")
-    for service in grad_services:
-        print(f"  - {service}")
+
+def _evaluate_rules(student: Student) -> Tuple[CampusService, ...]:
+    mask = 0
+    for predicate, bits in RULES:
+        if predicate(student):
+            mask |= bits
+    return BIT_TO_SORTED_TUPLE[mask]
+
+def authorize_campus_services(student: Student) -> Tuple[CampusService, ...]:
+    """
+    Pure function that maps Student → Tuple[CampusService, ...]
+    Following functional composition principles: f: Student → Tuple[CampusService, ...]
+    Results are memoized on the attributes the rules depend on.
+    """
+    key = _rule_key(student)
+    services = _AUTHORIZATION_CACHE.get(key)
+    if services is None:
+        services = _AUTHORIZATION_CACHE[key] = _evaluate_rules(student)
+    return services
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # The demo lives in example_usage.py; run it when this module is executed
+    from example_usage import main
+    main()
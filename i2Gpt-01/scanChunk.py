@@ -1,9 +1,13 @@
 # Python Script to Crawl and Parse Pages
 # Install dependencies:
-# pip install requests beautifulsoup4 markdownify
+# pip install requests lxml markdownify
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import json
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+import lxml.etree
+import lxml.html
 from markdownify import markdownify as md
 
 urls = [
@@ -12,28 +16,42 @@ urls = [
     # Add more wiki URLs here
 ]
 
+# Pages are fetched concurrently; this also caps the load put on the wiki
+MAX_WORKERS = 16
+
+# One session reuses TCP/TLS connections across requests, with a pool
+# large enough that concurrent workers don't discard connections
+session = requests.Session()
+session.headers.update({'User-Agent': 'Mozilla/5.0'})
+session.mount('https://', HTTPAdapter(pool_maxsize=MAX_WORKERS))
+
 def fetch_page(url):
-    headers = {'User-Agent': 'Mozilla/5.0'}
-    resp = requests.get(url, headers=headers)
+    resp = session.get(url)
     if resp.status_code != 200:
         return None
     
-    soup = BeautifulSoup(resp.text, 'html.parser')
-    content = soup.find('div', {'id': 'main-content'})
-    if not content:
+    # Parse the raw bytes with libxml2 and jump straight to the content node
+    try:
+        tree = lxml.html.fromstring(resp.content)
+    except lxml.etree.ParserError:  # Empty or whitespace-only body; skip the page
         return None
-    return md(str(content))
+    content = tree.get_element_by_id('main-content', None)
+    if content is None:
+        return None
+    return md(lxml.html.tostring(content, encoding='unicode', with_tail=False))
 
-docs = {}
-for url in urls:
-    md_text = fetch_page(url)
-    if md_text:
-        docs[url] = md_text
-        print(f"Fetched: {url}")
+def fetch_all(urls):
+    """Yield (url, markdown) pairs in completion order."""
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = {executor.submit(fetch_page, url): url for url in urls}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
 
-# Save for later embedding
-import json
-with open('grouper_docs.json', 'w') as f:
-    json.dump(docs, f, indent=2)
+# Save for later embedding, writing each page as soon as it arrives
+with open('grouper_docs.jsonl', 'w', encoding='utf-8') as f:
+    for url, md_text in fetch_all(urls):
+        if md_text:
+            f.write(json.dumps({"url": url, "md": md_text}, ensure_ascii=False) + "\n")
+            print(f"Fetched: {url}")
 
-# This will save a JSON file with URLs as keys and Markdown-formatted content as values.
\ No newline at end of file
+# This will save a JSON Lines file with one {"url", "md"} object per page, holding the Markdown-formatted content.
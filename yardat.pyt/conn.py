@@ -3,6 +3,10 @@
 import sys
 from typing import List
 
+CONNECTION_TEMPLATE = "MATCH (r:Person {Id: '48'}) OPTIONAL MATCH (s:Person {Id: '{m}'}) WITH r, s  WHERE s IS NOT NULL MERGE (r)-[:CONNECTED_WITH]->(s);"
+# Split once so each statement is a plain concatenation rather than a template scan
+CONNECTION_PREFIX, CONNECTION_SUFFIX = CONNECTION_TEMPLATE.split('{m}')
+
 def read_lines(filename: str) -> List[str]:
     """
     Pure function: (filename, int) → List[str]
@@ -10,10 +14,7 @@ def read_lines(filename: str) -> List[str]:
     """
     try:
         with open(filename, 'r', encoding='utf-8') as f:
-            lines = []
-            for i, line in enumerate(f):
-                lines.append(line.strip())
-            return lines
+            return [line.strip() for line in f]
     except FileNotFoundError:
         print(f"Error: File '{filename}' not found.")
         sys.exit(1)
@@ -26,18 +27,13 @@ def generate_connection_statements(lines: List[str]) -> List[str]:
     Pure function: List[str] → List[str]
     Generates connection statements with incrementing integers starting at 1
     """
-    template = "MATCH (r:Person {Id: '48'}) OPTIONAL MATCH (s:Person {Id: '{m}'}) WITH r, s  WHERE s IS NOT NULL MERGE (r)-[:CONNECTED_WITH]->(s);" 
-
-    connection_statements = []
-    m = 1  # Initialize counter
+    non_empty = filter(None, map(str.strip, lines))  # Skip empty lines
     
-    for line in lines:
-        if line.strip():  # Skip empty lines
-            connection_statement = template.replace('{m}', str(m))
-            connection_statements.append(connection_statement)
-            m += 1  # Increment counter
-         
-    return connection_statements
+    # Counter starts at 1
+    return [
+        f"{CONNECTION_PREFIX}{m}{CONNECTION_SUFFIX}"
+        for m, _ in enumerate(non_empty, start=1)
+    ]
 
 def write_to_adoc_file(lines: List[str], filename: str) -> None:
     """
@@ -45,8 +41,9 @@ def write_to_adoc_file(lines: List[str], filename: str) -> None:
     """
     try:
         with open(filename, 'w', encoding='utf-8') as f:
-            for line in lines:
-                f.write(line + '\n')
+            f.write('\n'.join(lines))
+            if lines:  # Add newline at end if there are lines
+                f.write('\n')
     except IOError as e:
         print(f"Error writing to file '{filename}': {e}")
         sys.exit(1)
@@ -4,6 +4,13 @@ import sys
 import re
 from typing import List, Dict
 
+CYPHER_TEMPLATE = 'MERGE (p{m}:Person { Id: "{m}", Name: "{n}" });'
+# Fragments around the {m}, {m} and {n} placeholders, split once at import
+CYPHER_PREFIX, CYPHER_ID_SEP, CYPHER_NAME_SEP, CYPHER_SUFFIX = re.split(r'\{[mn]\}', CYPHER_TEMPLATE)
+
+# Match {n} where n is any number (without leading zeros, which never had a key)
+EXPRESSION_PATTERN = re.compile(r'\{(0|[1-9]\d*)\}')
+
 def read_lines_from_file(filename: str) -> List[str]:
     """
     Pure function: filename → List[str]
@@ -11,7 +18,7 @@ def read_lines_from_file(filename: str) -> List[str]:
     """
     try:
         with open(filename, 'r', encoding='utf-8') as f:
-            return [line.strip() for line in f.readlines()]
+            return [line.strip() for line in f]
     except FileNotFoundError:
         print(f"Error: File '{filename}' not found.")
         sys.exit(1)
@@ -19,47 +26,40 @@ def read_lines_from_file(filename: str) -> List[str]:
         print(f"Error reading file '{filename}': {e}")
         sys.exit(1)
 
-def create_replacement_map(lines: List[str]) -> Dict[str, str]:
+def create_replacement_map(lines: List[str]) -> Dict[int, str]:
     """
-    Pure function: List[str] → Dict[str, str]
-    Creates a mapping from {n} patterns to corresponding line text
+    Pure function: List[str] → Dict[int, str]
+    Creates a mapping from line index to line text, skipping empty lines
     """
-    replacement_map = {}
-    for i, line in enumerate(lines):
-        if line:  # Skip empty lines
-            replacement_map[f"{{{i}}}"] = line
-            replacement_map[f"{{{i+1}}}"] = line  # Support both 0-based and 1-based indexing
-    return replacement_map
+    return {i: line for i, line in enumerate(lines) if line}
 
-def replace_expressions(text: str, replacement_map: Dict[str, str]) -> str:
+def replace_expressions(text: str, replacement_map: Dict[int, str]) -> str:
     """
-    Pure function: (str, Dict[str, str]) → str
+    Pure function: (str, Dict[int, str]) → str
     Replaces {n} expressions in text with corresponding values from replacement_map
     """
     def replace_func(match):
-        pattern = match.group(0)
-        return replacement_map.get(pattern, pattern)  # Return original if not found
+        n = int(match.group(1))
+        # Support both 0-based and 1-based indexing, preferring the 0-based line
+        line = replacement_map.get(n)
+        if line is None:
+            line = replacement_map.get(n - 1, match.group(0))  # Return original if not found
+        return line
     
-    # Match {n} where n is any number
-    pattern = r'\{\d+\}'
-    return re.sub(pattern, replace_func, text)
+    return EXPRESSION_PATTERN.sub(replace_func, text)
 
 def generate_cypher_statements(lines: List[str]) -> List[str]:
     """
     Pure function: List[str] → List[str]
     Generates Cypher CREATE/MERGE statements for each line with incremental IDs
     """
-    template = 'MERGE (p{m}:Person { Id: "{m}", Name: "{n}" });'
-    cypher_statements = []
-    m = 1   # Initialize counter to 1 for the appended lines
-    
-    for line in lines:
-        if line.strip():  # Skip empty lines
-            cypher_statement = template.replace('{m}', str(m)).replace('{n}', line.strip())
-            cypher_statements.append(cypher_statement)
-            m += 1  # Increment counter
+    stripped = filter(None, map(str.strip, lines))  # Skip empty lines, stripping once
     
-    return cypher_statements
+    # Counter starts at 1 for the appended lines
+    return [
+        f"{CYPHER_PREFIX}{m}{CYPHER_ID_SEP}{m}{CYPHER_NAME_SEP}{line}{CYPHER_SUFFIX}"
+        for m, line in enumerate(stripped, start=1)
+    ]
 
 # This function writes a list of Cypher statements to a file, appending to the file if it already exists. If an I/O error occurs, it prints the error message and exits the program.
 def write_cypher_to_file(statements: List[str], filename: str) -> None:
@@ -68,8 +68,9 @@ def write_cypher_to_file(statements: List[str], filename: str) -> None:
     """
     try:
         with open(filename, 'a', encoding='utf-8') as f:
-            for statement in statements:
-                f.write(statement + '\n')
+            f.write('\n'.join(statements))
+            if statements:  # Add newline at end if there are statements
+                f.write('\n')
     except IOError as e:
         print(f"Error writing to file '{filename}': {e}")
         sys.exit(1)
@@ -7,6 +7,11 @@ from functools import reduce, partial
 from typing import Set, List, Callable, Tuple
 # from compose-operator import compose as op_compose  # Python 3.9+
 
+# Lines joined per write; bounds the temporary string to about 1 MiB for
+# name-length lines instead of the size of the whole output
+WRITE_BATCH_LINES = 1 << 14
+
+
 def op_compose(*funcs):
     def inner(arg):
         return reduce(lambda x, f: f(x), funcs, arg)
@@ -27,15 +32,15 @@ def pipe(*funcs):
 def read_lines(filepath: str) -> List[str]:
     """Read lines from a file, stripping whitespace."""
     with open(filepath, 'r') as f:
-        return [line.strip() for line in f if line.strip()]
+        return [line for line in map(str.strip, f) if line]
 
 
 def write_lines(filepath: str, lines: List[str]) -> None:
     """Write lines to a file (curried for functional composition)."""
     with open(filepath, 'w') as f:
-        f.write('\n'.join(lines))
-        if lines:  # Add newline at end if there are lines
-            f.write('\n')
+        for start in range(0, len(lines), WRITE_BATCH_LINES):
+            f.write('\n'.join(lines[start:start + WRITE_BATCH_LINES]))
+            f.write('\n')  # Ends the batch, and the file after the last one
 
 
 # Set operations
@@ -57,7 +62,7 @@ def in_set(inclusion_set: Set[str]) -> Callable[[str], bool]:
 # Main operations
 def get_unique_lines(file1: str, file2: str) -> List[str]:
     """Get lines from file2 that don't appear in file1."""
-    names_to_exclude = compose(to_set, read_lines)(file1)
+    names_to_exclude = to_set(read_lines(file1))
     
     return list(filter(
         not_in_set(names_to_exclude),
@@ -67,7 +72,7 @@ def get_unique_lines(file1: str, file2: str) -> List[str]:
 
 def get_common_lines(file1: str, file2: str) -> List[str]:
     """Get lines that appear in both files."""
-    names_from_file1 = compose(to_set, read_lines)(file1)
+    names_from_file1 = to_set(read_lines(file1))
     
     return list(filter(
         in_set(names_from_file1),
@@ -88,18 +93,27 @@ def deduplicate_files(file1: str, file2: str, output_file: str = None) -> Tuple[
         Tuple of (original_count, filtered_count, removed_count)
     """
     output_file = output_file or file2
-    
-    # Get counts
-    original_lines = read_lines(file2)
-    unique_lines = get_unique_lines(file1, file2)
+    names_to_exclude = to_set(read_lines(file1))
+    
+    # Count and filter file2 in a single pass
+    original_count = 0
+    unique_lines = []
+    with open(file2, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            original_count += 1
+            if line not in names_to_exclude:
+                unique_lines.append(line)
     
     # Write filtered lines
     write_lines(output_file, unique_lines)
     
     return (
-        len(original_lines),
+        original_count,
         len(unique_lines),
-        len(original_lines) - len(unique_lines)
+        original_count - len(unique_lines)
     )
 
 
@@ -126,24 +140,27 @@ def case_insensitive_deduplicate(file1: str, file2: str, output_file: str = None
     output_file = output_file or file2
     
     # Convert file1 names to lowercase for comparison
-    names_to_exclude = compose(
-        lambda names: {name.lower() for name in names},
-        read_lines
-    )(file1)
-    
-    # Filter file2 keeping only lines not in file1 (case-insensitive)
-    original_lines = read_lines(file2)
-    unique_lines = [
-        line for line in original_lines 
-        if line.lower() not in names_to_exclude
-    ]
+    names_to_exclude = {name.lower() for name in read_lines(file1)}
+    
+    # Filter file2 keeping only lines not in file1 (case-insensitive),
+    # counting in the same pass
+    original_count = 0
+    unique_lines = []
+    with open(file2, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            original_count += 1
+            if line.lower() not in names_to_exclude:
+                unique_lines.append(line)
     
     write_lines(output_file, unique_lines)
     
     return (
-        len(original_lines),
+        original_count,
         len(unique_lines),
-        len(original_lines) - len(unique_lines)
+        original_count - len(unique_lines)
     )
 
 
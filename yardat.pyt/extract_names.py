@@ -3,45 +3,79 @@
 Extract person names from PDF using functional programming approach.
 """
 
+import hashlib
+import json
+import os
 import re
-from functools import reduce, partial
+import tempfile
 from itertools import chain
-from typing import List, Set, Callable, Iterable
-import PyPDF2
+from pathlib import Path
+from typing import List, Set, Callable, Iterable, Iterator
+import pypdfium2 as pdfium
 import spacy
 
-# Load spaCy model for NER
+# Extracted names are cached per PDF content hash; xxh3 (pip install xxhash)
+# hashes at memory speed, with blake2b from the standard library as fallback
 try:
-    nlp = spacy.load("en_core_web_sm")
+    import xxhash
+except ImportError:
+    xxhash = None
+CACHE_DIR = Path.home() / ".cache" / "yardat"
+# Keeps results of the different extractors apart; bump the version whenever
+# the extraction rules change so that older cached results are ignored
+CACHE_TAG = "spacy-v2"
+
+# Components NER does not need (en_core_web_sm's ner has its own embedding layer)
+UNUSED_PIPES = ["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer"]
+
+# Run inference on the GPU when one is available (no-op on CPU-only machines)
+spacy.prefer_gpu()
+
+# Load spaCy model for NER once per process; excluded components are never deserialized
+try:
+    nlp = spacy.load("en_core_web_sm", exclude=UNUSED_PIPES)
 except OSError:
     print("Installing spaCy English model...")
     import subprocess
     subprocess.run(["python", "-m", "spacy", "download", "en_core_web_sm"])
-    nlp = spacy.load("en_core_web_sm")
+    nlp = spacy.load("en_core_web_sm", exclude=UNUSED_PIPES)
+
+
+# Patterns compiled once at import rather than on every call
+WHITESPACE_PATTERN = re.compile(r'\s+')
+TITLE_PREFIX_PATTERN = re.compile(r'^(Mr\.|Mrs\.|Ms\.|Dr\.|Prof\.|Sir|Dame|Lord|Lady)\s+', re.IGNORECASE)
+SUFFIX_PATTERN = re.compile(r'\s+(Jr\.|Sr\.|III|II|IV|PhD|MD|Esq\.)$', re.IGNORECASE)
+INVALID_CHAR_PATTERN = re.compile(r'[0-9@#$%^&*()_+=\[\]{};:"<>?/\\|]')
 
 
 def read_pdf(filepath: str) -> List[str]:
     """Read PDF and return list of text from all pages."""
-    with open(filepath, 'rb') as file:
-        reader = PyPDF2.PdfReader(file)
-        return [page.extract_text() for page in reader.pages]
+    pdf = pdfium.PdfDocument(filepath)
+    try:
+        pages = []
+        for page in pdf:
+            textpage = page.get_textpage()
+            pages.append(textpage.get_text_range())
+            textpage.close()
+            page.close()
+        return pages
+    finally:
+        pdf.close()
 
 
-def extract_entities(text: str) -> List[str]:
-    """Extract named entities from text using spaCy."""
-    doc = nlp(text)
-    return [ent.text for ent in doc.ents if ent.label_ == "PERSON"]
+def extract_entities_batch(pages: Iterable[str], batch_size: int = 32) -> Iterator[List[str]]:
+    """Extract named entities from many texts, batching them through spaCy."""
+    for doc in nlp.pipe(pages, batch_size=batch_size):
+        yield [ent.text for ent in doc.ents if ent.label_ == "PERSON"]
 
 
 def clean_name(name: str) -> str:
     """Clean and normalize a name."""
     # Remove extra whitespace and newlines
-    name = re.sub(r'\s+', ' ', name.strip())
+    name = WHITESPACE_PATTERN.sub(' ', name.strip())
     # Remove common titles and suffixes
-    titles = r'^(Mr\.|Mrs\.|Ms\.|Dr\.|Prof\.|Sir|Dame|Lord|Lady)\s+'
-    suffixes = r'\s+(Jr\.|Sr\.|III|II|IV|PhD|MD|Esq\.)$'
-    name = re.sub(titles, '', name, flags=re.IGNORECASE)
-    name = re.sub(suffixes, '', name, flags=re.IGNORECASE)
+    name = TITLE_PREFIX_PATTERN.sub('', name)
+    name = SUFFIX_PATTERN.sub('', name)
     return name
 
 
@@ -57,31 +91,60 @@ def is_valid_name(name: str) -> bool:
     if name.isupper() or name.islower():
         return False
     # Should not contain numbers or special characters (except . and -)
-    if re.search(r'[0-9@#$%^&*()_+=\[\]{};:"<>?/\\|]', name):
+    if INVALID_CHAR_PATTERN.search(name):
         return False
     return True
 
 
-# Functional pipeline components
-compose = lambda *funcs: reduce(lambda f, g: lambda x: f(g(x)), funcs, lambda x: x)
-flatten = lambda lst: list(chain.from_iterable(lst))
-unique = lambda lst: list(dict.fromkeys(lst))  # Preserves order
+def pdf_digest(filepath: str) -> str:
+    """Hash the PDF's bytes, reading it in 1 MiB chunks."""
+    hasher = xxhash.xxh3_64() if xxhash is not None else hashlib.blake2b(digest_size=16)
+    with open(filepath, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            hasher.update(chunk)
+    return hasher.hexdigest()
 
 
 def extract_names_from_pdf(filepath: str) -> List[str]:
+    """Extract names from PDF, reusing the cached result if the file is unchanged."""
+    cache_path = CACHE_DIR / f"{pdf_digest(filepath)}-{CACHE_TAG}.json"
+    try:
+        return json.loads(cache_path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        pass  # Not cached yet, or a damaged entry; extract again
+    
+    names = extract_names_uncached(filepath)
+    # Write to a temporary file and rename, so an interrupted run never
+    # leaves a truncated entry behind
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix='.tmp')
+        try:
+            try:
+                f = open(fd, 'w', encoding='utf-8')
+            except BaseException:
+                os.close(fd)  # open() failed before taking ownership of fd
+                raise
+            with f:
+                json.dump(names, f)
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+    except OSError:
+        pass  # Caching is best-effort; the names are still valid
+    return names
+
+
+def extract_names_uncached(filepath: str) -> List[str]:
     """Main functional pipeline to extract names from PDF."""
-    # Define the pipeline
-    pipeline = compose(
-        sorted,  # Sort alphabetically
-        unique,  # Remove duplicates
-        partial(filter, is_valid_name),  # Filter valid names
-        partial(map, clean_name),  # Clean names
-        flatten,  # Flatten list of lists
-        partial(map, extract_entities),  # Extract entities from each page
-        read_pdf  # Read PDF pages
-    )
+    # Each stage is a lazy iterator, so pages flow through in a single pass
+    pages = read_pdf(filepath)  # Read PDF pages
+    entities = extract_entities_batch(pages)  # Extract entities from pages in batches
+    names = map(clean_name, chain.from_iterable(entities))  # Flatten and clean names
+    valid_names = filter(is_valid_name, names)  # Filter valid names
     
-    return pipeline(filepath)
+    return sorted(set(valid_names))  # Remove duplicates, sort alphabetically
 
 
 def write_adoc(names: List[str], output_file: str) -> None:
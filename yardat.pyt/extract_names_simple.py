@@ -4,32 +4,70 @@ Extract person names from PDF using functional programming approach.
 Uses pattern matching instead of NLP for simpler deployment.
 """
 
+import hashlib
+import json
+import os
 import re
-from functools import reduce, partial
+import tempfile
 from itertools import chain
+from pathlib import Path
 from typing import List, Set, Callable, Iterable
-import PyPDF2
+import pypdfium2 as pdfium
+
+# Extracted names are cached per PDF content hash; xxh3 (pip install xxhash)
+# hashes at memory speed, with blake2b from the standard library as fallback
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+CACHE_DIR = Path.home() / ".cache" / "yardat"
+
+# google-re2 (pip install google-re2) scans page text in linear time with a
+# DFA; fall back to the backtracking re engine when it is not installed
+try:
+    import re2
+except ImportError:
+    re2 = None
+SCAN_ENGINE = re2 if re2 is not None else re
+
+# Keeps results of the different extractors apart; bump the version whenever
+# the extraction rules change so that older cached results are ignored.
+# The engine is part of the tag since RE2's \s and \b are ASCII-only.
+CACHE_TAG = f"regex-v2-{SCAN_ENGINE.__name__}"
+
+
+# Patterns compiled once at import rather than on every call
+WHITESPACE_PATTERN = re.compile(r'\s+')
+TITLE_PREFIX_PATTERN = re.compile(r'^(Mr\.|Mrs\.|Ms\.|Dr\.|Prof\.|Sir|Dame|Lord|Lady)\s+', re.IGNORECASE)
+SUFFIX_PATTERN = re.compile(r'\s+(Jr\.|Sr\.|III|II|IV|PhD|MD|Esq\.)$', re.IGNORECASE)
+# Pattern for names: Capitalized words, possibly with middle initials
+# Matches: John Smith, John Q. Smith, Mary Jane Smith, etc.
+NAME_PATTERN = SCAN_ENGINE.compile(r'\b([A-Z][a-z]+(?:\s+[A-Z]\.?)?(?:\s+[A-Z][a-z]+)+)\b')
+TITLE_NAME_PATTERN = SCAN_ENGINE.compile(r'\b(?:Mr\.|Mrs\.|Ms\.|Dr\.|Prof\.|Sir|Dame|Lord|Lady)\s+([A-Z][a-z]+(?:\s+[A-Z]\.?)?(?:\s+[A-Z][a-z]+)+)\b')
 
 
 def read_pdf(filepath: str) -> List[str]:
     """Read PDF and return list of text from all pages."""
-    with open(filepath, 'rb') as file:
-        reader = PyPDF2.PdfReader(file)
-        return [page.extract_text() for page in reader.pages]
+    pdf = pdfium.PdfDocument(filepath)
+    try:
+        pages = []
+        for page in pdf:
+            textpage = page.get_textpage()
+            pages.append(textpage.get_text_range())
+            textpage.close()
+            page.close()
+        return pages
+    finally:
+        pdf.close()
 
 
 def extract_potential_names(text: str) -> List[str]:
     """Extract potential names using regex patterns."""
-    # Pattern for names: Capitalized words, possibly with middle initials
-    # Matches: John Smith, John Q. Smith, Mary Jane Smith, etc.
-    name_pattern = r'\b([A-Z][a-z]+(?:\s+[A-Z]\.?)?(?:\s+[A-Z][a-z]+)+)\b'
-    
     # Find all matches
-    matches = re.findall(name_pattern, text)
+    matches = NAME_PATTERN.findall(text)
     
     # Also look for specific patterns with titles
-    title_pattern = r'\b(?:Mr\.|Mrs\.|Ms\.|Dr\.|Prof\.|Sir|Dame|Lord|Lady)\s+([A-Z][a-z]+(?:\s+[A-Z]\.?)?(?:\s+[A-Z][a-z]+)+)\b'
-    title_matches = re.findall(title_pattern, text)
+    title_matches = TITLE_NAME_PATTERN.findall(text)
     
     return matches + title_matches
 
@@ -37,12 +75,10 @@ def extract_potential_names(text: str) -> List[str]:
 def clean_name(name: str) -> str:
     """Clean and normalize a name."""
     # Remove extra whitespace and newlines
-    name = re.sub(r'\s+', ' ', name.strip())
+    name = WHITESPACE_PATTERN.sub(' ', name.strip())
     # Remove common titles and suffixes
-    titles = r'^(Mr\.|Mrs\.|Ms\.|Dr\.|Prof\.|Sir|Dame|Lord|Lady)\s+'
-    suffixes = r'\s+(Jr\.|Sr\.|III|II|IV|PhD|MD|Esq\.)$'
-    name = re.sub(titles, '', name, flags=re.IGNORECASE)
-    name = re.sub(suffixes, '', name, flags=re.IGNORECASE)
+    name = TITLE_PREFIX_PATTERN.sub('', name)
+    name = SUFFIX_PATTERN.sub('', name)
     return name
 
 
@@ -95,26 +131,55 @@ def is_valid_name(name: str) -> bool:
     return True
 
 
-# Functional pipeline components
-compose = lambda *funcs: reduce(lambda f, g: lambda x: f(g(x)), funcs, lambda x: x)
-flatten = lambda lst: list(chain.from_iterable(lst))
-unique = lambda lst: list(dict.fromkeys(lst))  # Preserves order
+def pdf_digest(filepath: str) -> str:
+    """Hash the PDF's bytes, reading it in 1 MiB chunks."""
+    hasher = xxhash.xxh3_64() if xxhash is not None else hashlib.blake2b(digest_size=16)
+    with open(filepath, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            hasher.update(chunk)
+    return hasher.hexdigest()
 
 
 def extract_names_from_pdf(filepath: str) -> List[str]:
+    """Extract names from PDF, reusing the cached result if the file is unchanged."""
+    cache_path = CACHE_DIR / f"{pdf_digest(filepath)}-{CACHE_TAG}.json"
+    try:
+        return json.loads(cache_path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        pass  # Not cached yet, or a damaged entry; extract again
+    
+    names = extract_names_uncached(filepath)
+    # Write to a temporary file and rename, so an interrupted run never
+    # leaves a truncated entry behind
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix='.tmp')
+        try:
+            try:
+                f = open(fd, 'w', encoding='utf-8')
+            except BaseException:
+                os.close(fd)  # open() failed before taking ownership of fd
+                raise
+            with f:
+                json.dump(names, f)
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+    except OSError:
+        pass  # Caching is best-effort; the names are still valid
+    return names
+
+
+def extract_names_uncached(filepath: str) -> List[str]:
     """Main functional pipeline to extract names from PDF."""
-    # Define the pipeline
-    pipeline = compose(
-        sorted,  # Sort alphabetically
-        unique,  # Remove duplicates
-        partial(filter, is_valid_name),  # Filter valid names
-        partial(map, clean_name),  # Clean names
-        flatten,  # Flatten list of lists
-        partial(map, extract_potential_names),  # Extract names from each page
-        read_pdf  # Read PDF pages
-    )
+    # Each stage is a lazy iterator, so pages flow through in a single pass
+    pages = read_pdf(filepath)  # Read PDF pages
+    candidates = map(extract_potential_names, pages)  # Extract names from each page
+    names = map(clean_name, chain.from_iterable(candidates))  # Flatten and clean names
+    valid_names = filter(is_valid_name, names)  # Filter valid names
     
-    return pipeline(filepath)
+    return sorted(set(valid_names))  # Remove duplicates, sort alphabetically
 
 
 def write_adoc(names: List[str], output_file: str) -> None:
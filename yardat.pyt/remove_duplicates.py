@@ -3,87 +3,328 @@
 Functional Python script to remove lines from file2 that match lines in file1.
 """
 
-from functools import reduce, partial
-from typing import Set, List, Callable
+from contextlib import contextmanager
+from functools import partial
+from itertools import filterfalse
+from typing import BinaryIO, Collection, Iterable, Iterator, List, Tuple
+import hashlib
+import mmap
+import os
+import pickle
+import shutil
+import subprocess
 import sys
+import tempfile
 
+# marisa-trie (pip install marisa-trie) stores file1 as a compact trie for
+# --trie, far smaller than a set when lines share long prefixes (URLs, paths)
+try:
+    import marisa_trie
+except ImportError:
+    marisa_trie = None
 
-def read_lines(filepath: str) -> List[str]:
-    """Read lines from a file, stripping whitespace."""
-    with open(filepath, 'r') as f:
-        return [line.strip() for line in f if line.strip()]
+# 1 MiB I/O buffers instead of the 8 KiB default, to cut read/write syscalls
+BUFFER_SIZE = 1 << 20
 
+# --cache: pickled exclusion sets, reused while file1 is unchanged
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'remove_duplicates')
 
-def write_lines(lines: List[str], filepath: str) -> None:
-    """Write lines to a file."""
-    with open(filepath, 'w') as f:
-        f.write('\n'.join(lines))
-        if lines:  # Add newline at end if there are lines
-            f.write('\n')
+# --sorted: GNU sort's in-memory buffer before it spills to temporary files
+SORT_BUFFER_SIZE = '2G'
 
 
-def lines_to_set(lines: List[str]) -> Set[str]:
-    """Convert list of lines to a set for efficient lookup."""
-    return set(lines)
+def load_exclusion_set(filepath: str, trie: bool = False) -> Collection[bytes]:
+    """
+    Build the immutable set of stripped, non-empty lines in a file, as raw bytes.
+    The file is memory-mapped and split in single C-level calls, with
+    no decoding and no per-line Python work.
+    With trie=True the lines go into a marisa BinaryTrie instead of a frozenset.
+    """
+    with open(filepath, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:  # mmap rejects empty files
+            return marisa_trie.BinaryTrie() if trie else frozenset()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            data = mm[:]
+    lines = filter(None, map(bytes.strip, data.splitlines()))
+    return marisa_trie.BinaryTrie(lines) if trie else frozenset(lines)
+
+
+def load_or_build_set(filepath: str, trie: bool = False) -> Collection[bytes]:
+    """
+    Load a file's exclusion set from the on-disk cache, building and
+    caching it when the file is new or has changed since the last run.
+    Entries are named by the file's absolute path, mtime and size; older
+    entries for the same path are removed when a new one is written.
+    """
+    stat = os.stat(filepath)
+    kind = 'trie-strip' if trie else 'bytes-strip'
+    stem = hashlib.blake2b(f"{kind}:{os.path.abspath(filepath)}".encode(), digest_size=16).hexdigest()
+    cache_name = f"{stem}-{stat.st_mtime_ns}-{stat.st_size}.pkl"
+    cache_path = os.path.join(CACHE_DIR, cache_name)
+    try:
+        with open(cache_path, 'rb') as f:
+            return pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        pass  # Not cached yet, or unreadable; rebuild below
+    
+    name_set = load_exclusion_set(filepath, trie)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix='.tmp')
+        try:
+            with open(fd, 'wb') as f:
+                pickle.dump(name_set, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        # Entries for earlier versions of this file can never match again
+        for name in os.listdir(CACHE_DIR):
+            if name.startswith(stem + '-') and name.endswith('.pkl') and name != cache_name:
+                os.remove(os.path.join(CACHE_DIR, name))
+    except OSError:
+        pass  # Caching is best-effort; the set is still valid
+    return name_set
 
 
-def filter_not_in_set(name_set: Set[str]) -> Callable[[str], bool]:
-    """Return a predicate function that checks if a line is NOT in the given set."""
-    return lambda line: line not in name_set
+def count_lines(filepath: str) -> int:
+    """
+    Count the non-blank lines in a file, splitting it exactly as
+    remove_duplicates does, without decoding.
+    """
+    with open(filepath, 'rb', buffering=BUFFER_SIZE) as f:
+        return sum(len(list(filter(None, map(bytes.strip, block)))) for block in iter_line_blocks(f))
 
 
-def remove_duplicates(file1_path: str, file2_path: str) -> None:
+def iter_line_blocks(f: BinaryIO, size: int = BUFFER_SIZE) -> Iterator[List[bytes]]:
     """
-    Remove lines from file2 that appear in file1.
-    Uses functional programming approach.
+    Read a binary file about size bytes at a time, yielding each
+    chunk's complete lines (without line endings) as one list.
+    Lines end at \\n, \\r\\n or \\r, as in text mode.
     """
-    # Functional pipeline
-    compose = lambda *funcs: reduce(lambda f, g: lambda x: f(g(x)), funcs, lambda x: x)
+    tail = b''
+    for chunk in iter(partial(f.read, size), b''):
+        chunk = tail + chunk
+        cut = chunk.rfind(b'\n')
+        if cut < 0:  # No line ends in this chunk yet
+            tail = chunk
+            continue
+        tail = chunk[cut + 1:]
+        yield chunk[:cut].splitlines()
+    if tail:  # Last line without a trailing newline
+        yield tail.splitlines()
+
+
+@contextmanager
+def atomic_rewrite(filepath: str) -> Iterator[BinaryIO]:
+    """
+    Yield a binary file that replaces filepath once the block completes.
+    The new contents go to a private temporary file beside it, which
+    takes over filepath's permission bits and is fsynced, along with its
+    directory, around the rename. On error filepath is left untouched
+    and only that temporary file is removed.
+    """
+    filepath = os.path.realpath(filepath)  # Rewrite a symlink's target, not the link
+    directory = os.path.dirname(filepath)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(filepath) + '.', suffix='.tmp')
+    try:
+        with open(fd, 'wb', buffering=BUFFER_SIZE) as f:
+            yield f
+            # Data must be on disk before the rename makes it visible
+            f.flush()
+            os.fsync(f.fileno())
+        shutil.copymode(filepath, tmp_path)  # mkstemp creates the file as 0600
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
     
+    # Persist the rename itself
+    dir_fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+
+def remove_duplicates(file1_path: str, file2_path: str, unique: bool = False,
+                      trie: bool = False, cache: bool = False) -> Tuple[int, int, int]:
+    """
+    Remove lines from file2 that appear in file1.
+    With unique=True, repeated lines within file2 are dropped as well,
+    keeping the first occurrence.
+    With trie=True, file1 is held in a marisa trie rather than a set.
+    With cache=True, file1's set is kept on disk between runs.
+    Reads each file exactly once and returns
+    (names in file1, lines in file2 before, lines in file2 after).
+    When there is nothing to remove, file2 is not rewritten.
+    """
     # Read file1 and create a set of names to exclude
-    file1_names = compose(
-        lines_to_set,
-        read_lines
-    )(file1_path)
+    if cache:
+        file1_names = load_or_build_set(file1_path, trie)
+    else:
+        file1_names = load_exclusion_set(file1_path, trie)
+    
+    # Nothing to remove: skip the read+write pass and leave file2 as is
+    if os.path.getsize(file2_path) == 0:
+        return len(file1_names), 0, 0
+    if not file1_names and not unique:
+        line_count = count_lines(file2_path)
+        return 0, line_count, line_count
     
-    # Read file2, filter out names that appear in file1, and write back
-    pipeline = compose(
-        partial(write_lines, filepath=file2_path),
-        list,  # Convert filter object to list
-        partial(filter, filter_not_in_set(file1_names)),
-        read_lines
-    )
+    # --unique tracks lines already written in a separate set, leaving file1's as is
+    seen = set()
     
-    pipeline(file2_path)
+    # Stream file2 once in ~1 MiB blocks of whole lines, writing lines not in
+    # file1 to a temporary file that then replaces file2. Splitting, filtering
+    # and joining a whole block keeps per-line work inside C loops.
+    original_count = 0
+    final_count = 0
+    # Binary mode: lines are only compared for equality, so they are never decoded
+    with open(file2_path, 'rb', buffering=BUFFER_SIZE) as fin, atomic_rewrite(file2_path) as fout:
+        for block in iter_line_blocks(fin):
+            lines = list(filter(None, map(bytes.strip, block)))  # Strip and drop blank lines in C
+            # Bound set lookup driven from C; no Python frame per line
+            if unique:
+                lines_to_check = dict.fromkeys(lines)  # Drop repeats within the block
+                kept = list(filterfalse(seen.__contains__,
+                                        filterfalse(file1_names.__contains__, lines_to_check)))
+                seen.update(kept)
+            else:
+                kept = list(filterfalse(file1_names.__contains__, lines))
+            
+            original_count += len(lines)
+            final_count += len(kept)
+            if kept:
+                fout.write(b'\n'.join(kept))
+                fout.write(b'\n')
     
     # Return statistics for reporting
-    original_lines = read_lines(file2_path)
-    return len(file1_names), len(original_lines)
+    return len(file1_names), original_count, final_count
+
+
+def sort_unique(filepath: str, out_path: str, temp_dir: str) -> int:
+    """
+    Write the distinct stripped, non-empty lines of a file to out_path in byte order,
+    using GNU sort's parallel external merge sort so memory stays bounded.
+    Sort spills its runs to temp_dir rather than $TMPDIR.
+    Lines are split as in remove_duplicates and piped to sort.
+    Returns the number of non-blank lines read.
+    """
+    count = 0
+    with open(filepath, 'rb', buffering=BUFFER_SIZE) as f, subprocess.Popen(
+        ['sort', '-u', f'--buffer-size={SORT_BUFFER_SIZE}', f'--parallel={os.cpu_count() or 1}',
+         '-T', temp_dir, '-o', out_path],
+        stdin=subprocess.PIPE,
+        env={**os.environ, 'LC_ALL': 'C'},  # Byte order, matching bytes comparison below
+    ) as sort:
+        for block in iter_line_blocks(f):
+            lines = list(filter(None, map(bytes.strip, block)))
+            if lines:
+                sort.stdin.write(b'\n'.join(lines))
+                sort.stdin.write(b'\n')
+            count += len(lines)
+    if sort.returncode != 0:
+        raise subprocess.CalledProcessError(sort.returncode, sort.args)
+    return count
+
+
+def iter_sorted_lines(f: BinaryIO) -> Iterator[bytes]:
+    """Yield the lines of a sort output file, without their newlines."""
+    return (line.rstrip(b'\n') for line in f)
+
+
+def merge_difference(names: Iterator[bytes], lines: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    Pure function: (sorted names, sorted lines) → lines not in names
+    Walks both sorted streams once with two cursors.
+    """
+    name = next(names, None)
+    for line in lines:
+        while name is not None and name < line:
+            name = next(names, None)
+        if line != name:
+            yield line
+
+
+def remove_duplicates_sorted(file1_path: str, file2_path: str) -> Tuple[int, int, int]:
+    """
+    Remove lines from file2 that appear in file1 by sort-merge rather than
+    a hash set, for files too large to hold in memory.
+    file2 is left sorted, with repeated lines removed.
+    Returns (names in file1, lines in file2 before, lines in file2 after).
+    """
+    # Sorted copies and sort's own runs stay beside file2, on the same disk
+    work_dir = os.path.dirname(os.path.abspath(file2_path))
+    final_count = 0
+    with tempfile.TemporaryDirectory(dir=work_dir) as sort_dir:
+        sorted1 = os.path.join(sort_dir, 'file1')
+        sorted2 = os.path.join(sort_dir, 'file2')
+        sort_unique(file1_path, sorted1, sort_dir)
+        original_count = sort_unique(file2_path, sorted2, sort_dir)
+        name_count = count_lines(sorted1)
+        
+        with open(sorted1, 'rb', buffering=BUFFER_SIZE) as f1, \
+                open(sorted2, 'rb', buffering=BUFFER_SIZE) as f2, \
+                atomic_rewrite(file2_path) as fout:
+            for line in merge_difference(iter_sorted_lines(f1), iter_sorted_lines(f2)):
+                fout.write(line)
+                fout.write(b'\n')
+                final_count += 1
+    
+    return name_count, original_count, final_count
 
 
 def main():
     """Main function to handle command line arguments."""
-    if len(sys.argv) != 3:
-        print("Usage: python remove_duplicates.py <file1> <file2>")
+    args = sys.argv[1:]
+    unique = '--unique' in args
+    if unique:
+        args.remove('--unique')
+    trie = '--trie' in args
+    if trie:
+        args.remove('--trie')
+    sort_merge = '--sorted' in args
+    if sort_merge:
+        args.remove('--sorted')
+    cache = '--cache' in args
+    if cache:
+        args.remove('--cache')
+    
+    if len(args) != 2:
+        print("Usage: python remove_duplicates.py [--unique] [--trie] [--sorted] [--cache] <file1> <file2>")
         print("Removes lines from file2 that appear in file1")
+        print("With --unique, repeated lines within file2 are removed too")
+        print("With --trie, file1 is held in a compact trie (needs marisa-trie)")
+        print("With --sorted, files are sort-merged with GNU sort instead of loaded")
+        print("into memory; file2 is left sorted and unique, so --unique is implied")
+        print("and --trie and --cache cannot be used with it")
+        print(f"With --cache, file1's set is kept in {CACHE_DIR} for reuse while file1 is unchanged")
         sys.exit(1)
     
-    file1_path = sys.argv[1]
-    file2_path = sys.argv[2]
+    if sort_merge and (trie or cache):
+        print("Error: --sorted cannot be combined with --trie or --cache")
+        sys.exit(1)
+    
+    if trie and marisa_trie is None:
+        print("Error: --trie requires marisa-trie (pip install marisa-trie)")
+        sys.exit(1)
+    
+    file1_path, file2_path = args
     
     try:
-        # Get initial count for reporting
-        initial_count = len(read_lines(file2_path))
-        
-        # Perform the removal
-        remove_duplicates(file1_path, file2_path)
-        
-        # Get final count
-        final_count = len(read_lines(file2_path))
+        # Perform the removal; counts come back from the single pass
+        if sort_merge:
+            name_count, initial_count, final_count = remove_duplicates_sorted(file1_path, file2_path)
+        else:
+            name_count, initial_count, final_count = remove_duplicates(file1_path, file2_path, unique, trie, cache)
         
         # Report results
         print(f"File 1: {file1_path}")
         print(f"File 2: {file2_path}")
+        print(f"Names in file1: {name_count}")
         print(f"Lines in file2 before: {initial_count}")
         print(f"Lines in file2 after: {final_count}")
         print(f"Lines removed: {initial_count - final_count}")